@@ -1,13 +1,30 @@
+import ast
+import functools
 import re
+import msgspec
 import numexpr
+import numpy as np
 import uvicorn
 
-from fastapi import FastAPI, HTTPException, status
+try:
+    import numba
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+    numba = None
+
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
 from dateutil.parser import parse as parse_date
 from typing import Any, Dict, List
 from . import schemas
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Regular expression to match different currency formats (ISO, symbols, etc.),
+# compiled once at import so the hot parse path skips the re-cache lookup.
+# Anchored so the engine fails fast on non-currency input.
+_CURRENCY_RE = re.compile(r'\A([A-Za-z]{3})?\s?\$?\s?([0-9,.]+)')
 
 
 def parse_currency(value: str) -> float:
@@ -24,14 +41,111 @@ def parse_currency(value: str) -> float:
         ValueError: invalid currency format
 
     """
-    # Regular expression to match different currency formats (ISO, symbols, etc.)
-    currency_pattern = r'([A-Za-z]{3})?\s?\$?\s?([0-9,.]+)'
-    match = re.match(currency_pattern, value.replace(',', ''))
+    # Fast path walking the regex's structure position by position: an
+    # optional three-letter ISO prefix, at most one space, at most one
+    # dollar sign, at most one space, then digits and dots only. Values
+    # shaped any other way fall through to the regex itself, so the fast
+    # path can neither over-strip nor widen the accepted grammar
+    s = value.replace(',', '')
+    i = 3 if s[:3].isascii() and s[:3].isalpha() else 0
+    if s[i:i + 1] == ' ':
+        i += 1
+    if s[i:i + 1] == '$':
+        i += 1
+    if s[i:i + 1] == ' ':
+        i += 1
+    rest = s[i:]
+    if rest and not rest.strip('0123456789.'):
+        try:
+            return float(rest)
+        except ValueError:
+            pass
+    # Fall back to the regex for anything the simple scan could not handle
+    match = _CURRENCY_RE.match(s)
     if match:
         return float(match.group(2))
     raise ValueError(f"Invalid currency format: {value}")
 
 
+@functools.lru_cache(maxsize=4096)
+def parse_datetime(value: str) -> datetime:
+    """
+    Parses a string representing a date/time into a datetime.
+
+    Tries the stdlib ISO-8601 parser first (the common case) and only falls
+    back to dateutil's slower format deduction for everything else. Results
+    are memoized since data rows frequently repeat the same date strings.
+
+    Args:
+        value (str): string representing a date/time
+
+    Returns:
+        datetime parsed from the string
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return parse_date(value)
+
+
+# Sentinel distinguishing a missing data-item key from a present None value
+_MISSING = object()
+
+# Accepted spellings for boolean variables sent as strings. A plain bool()
+# call would turn "false" into True, so string booleans go through a whitelist.
+_TRUE_STRINGS = {"true", "1", "yes"}
+_FALSE_STRINGS = {"false", "0", "no", ""}
+
+
+def _to_number(value: Any) -> float:
+    # JSON numbers arrive already deserialized; skip the float() call
+    if type(value) in (int, float):
+        return value
+    return float(value)
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+        raise ValueError(f"Invalid boolean value: {value}")
+    return bool(value)
+
+
+def _to_datetime(value: Any) -> Any:
+    return parse_datetime(value) if isinstance(value, str) else value
+
+
+def _to_percentage(value: Any) -> float:
+    if type(value) in (int, float):
+        return value
+    if isinstance(value, str) and value.endswith('%'):
+        return float(value.strip('%'))
+    return float(value)
+
+
+def _to_currency(value: Any) -> float:
+    if type(value) in (int, float):
+        return value
+    if isinstance(value, str):
+        return parse_currency(value)
+    return float(value)
+
+
+# Dispatch table keyed on varType: a single dict lookup on the hot path
+# instead of an if/elif chain per value
+_CONVERTERS = {
+    "number"    : _to_number,
+    "boolean"   : _to_bool,
+    "datetime"  : _to_datetime,
+    "percentage": _to_percentage,
+    "currency"  : _to_currency,
+}
+
+
 def convert_variable(value: Any, var_type: str) -> Any:
     """
     Convert the input variable to the appropriate type based on var_type.
@@ -42,82 +156,347 @@ def convert_variable(value: Any, var_type: str) -> Any:
     Returns:
         Converted input variable value
     """
+    converter = _CONVERTERS.get(var_type)
+    if converter is None:
+        raise ValueError(f"Unsupported variable type: {var_type}")
+    return converter(value)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_expression(expression: str):
+    """
+    Compile a formula expression to a reusable numexpr.NumExpr object.
+
+    Compiling once and calling the compiled object per data item avoids
+    re-parsing the expression and re-hashing its AST on every evaluation.
+    Expressions that cannot be compiled against the default (double)
+    signature, e.g. boolean-typed ones, return None so the caller can fall
+    back to numexpr.evaluate with type inference.
+
+    Args:
+        expression (str): formula expression source
+
+    Returns:
+        Compiled numexpr.NumExpr object, or None if compilation fails
+    """
+    try:
+        return numexpr.NumExpr(expression)
+    except Exception:
+        return None
+
+
+# Below roughly this many row-operations numexpr's worker-thread barrier
+# costs more than its SIMD evaluation saves (numexpr needs ~128-256k
+# elements to win), so smaller batches run as plain NumPy expressions
+_SMALL_WORKLOAD = 2 ** 17
+
+
+# AST nodes allowed in expressions the fused Numba kernel can compile:
+# plain float arithmetic only, so the generated loop stays type-stable
+_FUSABLE_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod)
+_FUSABLE_UNARYOPS = (ast.UAdd, ast.USub)
+
+
+def _fusable_names(expression: str):
+    """
+    Return the set of variable names used by the expression if it consists
+    purely of arithmetic over names and numeric constants, otherwise None.
+    """
     try:
-        if var_type == "number":
-            return float(value)
-        elif var_type == "boolean":
-            return bool(value)
-        elif var_type == "datetime":
-            return parse_date(value) if isinstance(value, str) else value
-        elif var_type == "percentage":
-            if isinstance(value, str) and value.endswith('%'):
-                return float(value.strip('%'))
-            return float(value)
-        elif var_type == "currency":
-            if isinstance(value, str):
-                return parse_currency(value)
-            return float(value)
-    except ValueError as e:
-        raise ValueError(e)
-    raise ValueError(f"Unsupported variable type: {var_type}")
-
-
-def validate_formulas(data: List[Dict[str, Any]], formulas: List[schemas.Formula]):
-    """
-    Validate that the submitted expression is both syntactically correctly and feasible based on provided inputs.
-
-    The functions perform syntax checks on the expression and ensures that all variable literals used within the formula
-    are defined in the provided input dictionary. If any variable in the expression is not present in the input data,
-    an error is raised.
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError:
+        return None
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Expression, ast.operator, ast.unaryop, ast.expr_context)):
+            continue
+        if isinstance(node, ast.BinOp) and isinstance(node.op, _FUSABLE_BINOPS):
+            continue
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, _FUSABLE_UNARYOPS):
+            continue
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            continue
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+            continue
+        return None
+    return names
+
+
+class _IndexedNames(ast.NodeTransformer):
+    """Rewrite every variable reference ``x`` to the array access ``_a_x[_i]``."""
+
+    def visit_Name(self, node):
+        indexed = ast.parse(f"_a_{node.id}[_i]", mode='eval').body
+        return ast.copy_location(indexed, node)
+
+
+@functools.lru_cache(maxsize=256)
+def _fused_kernel(steps: tuple, data_inputs: tuple):
+    """
+    Generate and JIT-compile a single loop computing all formula steps.
+
+    Fusing the whole chain into one Numba loop makes a single pass over
+    memory for all formulas, with no intermediate arrays handed between
+    them and none of numexpr's per-call thread synchronization. Compiled
+    kernels are cached per (steps, inputs) so repeated formula templates
+    pay the JIT cost once per process.
+
+    Args:
+        steps (tuple): (outputVar, expression) pairs in evaluation order
+        data_inputs (tuple): names of the input columns, in argument order
+
+    Returns:
+        JIT-compiled kernel, or None if code generation fails
+    """
+    if numba is None:
+        return None
+    params = ['_n']
+    params += [f"_a_{name}" for name in data_inputs]
+    params += [f"_a_{output_var}" for output_var, _ in steps]
+    lines = [f"def _fused({', '.join(params)}):", "    for _i in range(_n):"]
+    for output_var, expression in steps:
+        indexed = _IndexedNames().visit(ast.parse(expression, mode='eval'))
+        lines.append(f"        _a_{output_var}[_i] = {ast.unparse(ast.fix_missing_locations(indexed))}")
+    namespace = {}
+    try:
+        exec(compile('\n'.join(lines), '<fused-kernel>', 'exec'), {}, namespace)
+        # error_model='numpy' keeps IEEE semantics: a zero divisor yields
+        # inf/nan like the numexpr and NumPy paths, not ZeroDivisionError
+        return numba.njit(fastmath=True, error_model='numpy')(namespace['_fused'])
+    except Exception:
+        return None
+
+
+def _try_fused_evaluation(plan, columns, n_items):
+    """
+    Evaluate the whole formula plan through one fused JIT kernel.
+
+    Only applies when every expression is plain arithmetic, every output
+    name is a valid identifier and every input column is numeric; returns
+    None so the caller falls back to the numexpr path otherwise.
+
+    Args:
+        plan: resolved (outputVar, expression, inputs) triples in evaluation order
+        columns: converted input columns keyed by (name, type)
+        n_items (int): number of data items
+
+    Returns:
+        Dict mapping each outputVar to its result array, or None
+    """
+    if numba is None:
+        return None
+    steps = []
+    produced = set()
+    data_inputs = {}
+    for output_var, expression, inputs in plan:
+        if not output_var.isidentifier():
+            return None
+        names = _fusable_names(expression)
+        if names is None:
+            return None
+        types_by_name = {var_name: var_type for var_name, var_type, _ in inputs}
+        for name in names:
+            if name in produced:
+                continue
+            var_type = types_by_name.get(name)
+            if var_type is None or data_inputs.get(name, var_type) != var_type:
+                return None
+            data_inputs[name] = var_type
+        steps.append((output_var, expression))
+        produced.add(output_var)
+
+    args = []
+    for name, var_type in data_inputs.items():
+        column = columns[(name, var_type)]
+        if column.dtype.kind not in 'if':
+            return None
+        args.append(np.ascontiguousarray(column, dtype=np.float64))
+
+    kernel = _fused_kernel(tuple(steps), tuple(data_inputs))
+    if kernel is None:
+        return None
+    outputs = {output_var: np.empty(n_items, dtype=np.float64) for output_var, _ in steps}
+    try:
+        kernel(n_items, *args, *outputs.values())
+    except Exception:
+        # Any runtime failure in the kernel must degrade to the numexpr
+        # path, never escape as an internal server error
+        return None
+    return outputs
+
+
+@functools.lru_cache(maxsize=1024)
+def _numpy_callable(expression: str):
+    """
+    Compile an arithmetic-only expression to a function taking its
+    variables as positional arguments, for direct NumPy evaluation on
+    small batches.
+
+    Reuses the fused-kernel AST whitelist so only plain arithmetic over
+    variables and numeric constants is ever compiled; anything else
+    returns None and keeps going through numexpr. Taking the arrays
+    positionally means callers never build a namespace dict per call.
+
+    Args:
+        expression (str): formula expression source
+
+    Returns:
+        Tuple of (function, argument names), or None if the expression
+        is not plain arithmetic
+    """
+    names = _fusable_names(expression)
+    if names is None:
+        return None
+    arg_names = tuple(sorted(names))
+    source = f"def _expr({', '.join(arg_names)}):\n    return {expression}"
+    namespace = {}
+    try:
+        exec(compile(source, '<formula>', 'exec'), {"__builtins__": {}}, namespace)
+    except SyntaxError:
+        return None
+    return namespace['_expr'], arg_names
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_expression(expression: str) -> None:
+    """
+    Syntax-check a formula expression by parsing it, without executing it.
+
+    Parsing via the numexpr.NumExpr constructor avoids the full
+    compile-and-execute on dummy values (and numexpr's worker-thread
+    spinup) that numexpr.evaluate would incur. Parsing needs no input
+    values or names at all, so the verdict is memoized on the expression
+    source alone; API callers tend to resubmit the same formula templates
+    across requests.
+
+    Args:
+        expression (str): formula expression source
+
+    Raises:
+        Exception: If the expression fails to parse.
+    """
+    try:
+        numexpr.NumExpr(expression)
+    except NotImplementedError:
+        # The expression parsed but could not be typed against the default
+        # double signature (e.g. boolean operators); its syntax is valid.
+        pass
+
+
+# Bounded LRU of validation verdicts keyed by (formulas, data keys): API
+# callers typically resubmit the same formula templates, so a repeat skips
+# the graph build entirely. Values hold the topological order as indices.
+_VALIDATION_CACHE = OrderedDict()
+_VALIDATION_CACHE_SIZE = 256
+
+
+def validate_formulas(data: List[Dict[str, Any]], formulas: List[schemas.Formula]) -> List[schemas.Formula]:
+    """
+    Validate that the submitted expressions are both syntactically correct and feasible based on provided inputs.
+
+    The function performs syntax checks on each expression and builds the dependency graph between formulas and data
+    variables. Missing variables and circular references (including indirect cycles spanning several formulas) are
+    rejected in a single O(V+E) pass using Kahn's algorithm, and the resulting topological order is returned so
+    evaluation can run formulas in dependency order regardless of how they were submitted.
 
     Args:
         data (List[Dict[str, Any]]: Input data variables
         formulas (List[schemas.Formula]): List of formulas need to validate
 
+    Returns:
+        The formulas reordered so every formula comes after the formulas it depends on.
+
     Raises:
-        ValueError: If the expression contains undefined variable or has syntax errors.
+        HTTPException: If an expression contains an undefined variable, has syntax errors, or the formulas form a cycle.
     """
+    cache_key = (
+        tuple(
+                (formula.outputVar, formula.expression,
+                 tuple((input_var.varName, input_var.varType) for input_var in formula.inputs))
+                for formula in formulas
+        ),
+        tuple(sorted(data[0].keys())),
+    )
+    cached_order = _VALIDATION_CACHE.get(cache_key)
+    if cached_order is not None:
+        _VALIDATION_CACHE.move_to_end(cache_key)
+        return [formulas[idx] for idx in cached_order]
+
     available_vars = set(data[0].keys())  # All keys from the first data item
-    evaluated_vars = set()
+    producers = {formula.outputVar: idx for idx, formula in enumerate(formulas)}
 
-    for formula in formulas:
-        # Check if all input variables exist either in available_vars or evaluated_vars
-        for input_var in formula.inputs:
-            if input_var.varName not in available_vars and input_var.varName not in evaluated_vars:
-                raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Variable '{input_var.varName}' used in formula '{formula.outputVar}' is not "
-                               f"available in data or prior formulas."
-                )
+    indegree = [0] * len(formulas)
+    dependents = defaultdict(list)
+
+    for idx, formula in enumerate(formulas):
+        input_names = {input_var.varName for input_var in formula.inputs}
 
-        # Prevent circular references (outputVar cannot be an input of its own formula)
-        if formula.outputVar in [input_var.varName for input_var in formula.inputs]:
+        # Prevent direct circular references (outputVar cannot be an input of its own formula)
+        if formula.outputVar in input_names:
             raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Formula '{formula.outputVar}' cannot reference itself in its inputs."
             )
 
+        # Each input must come from the data or from some formula's output
+        for input_name in input_names:
+            if input_name in producers:
+                dependents[producers[input_name]].append(idx)
+                indegree[idx] += 1
+            elif input_name not in available_vars:
+                raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Variable '{input_name}' used in formula '{formula.outputVar}' is not "
+                               f"available in data or formula outputs."
+                )
+
         # Check for valid expression syntax using numexpr's parsing
         try:
-            numexpr.evaluate(formula.expression, local_dict={var.varName: 1 for var in formula.inputs})
+            _validate_expression(formula.expression)
         except Exception as e:
             raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Error evaluating expression: syntax error in formula '{formula.outputVar}' with expression '{formula.expression}': {str(e)}"
             )
 
-        # Add the formula's output variable to the list of evaluated variables
-        evaluated_vars.add(formula.outputVar)
+    # Kahn's algorithm: repeatedly release formulas whose dependencies are
+    # all satisfied; anything left over is part of a cycle
+    queue = deque(idx for idx in range(len(formulas)) if indegree[idx] == 0)
+    order = []
+    while queue:
+        idx = queue.popleft()
+        order.append(idx)
+        for dependent in dependents[idx]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                queue.append(dependent)
+
+    if len(order) != len(formulas):
+        ordered = set(order)
+        cyclic = [formulas[idx].outputVar for idx in range(len(formulas)) if idx not in ordered]
+        raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Formulas contain a circular dependency involving: {', '.join(cyclic)}."
+        )
+
+    _VALIDATION_CACHE[cache_key] = tuple(order)
+    if len(_VALIDATION_CACHE) > _VALIDATION_CACHE_SIZE:
+        _VALIDATION_CACHE.popitem(last=False)
+
+    return [formulas[idx] for idx in order]
 
 
 @app.post("/api/execute-formula")
-async def evaluate_formulas(request: schemas.FormulaRequest):
+async def evaluate_formulas(request: Request):
     """
     Receives the request to evaluate formulas.
 
     This function will validate the formulas and then evaluate the formulas to generate the result.
+    The raw body is decoded straight into msgspec structs, which parses and validates the (potentially
+    large) data list in C instead of running Pydantic's per-field validator loops.
     Args:
-        request (schemas.FormulaRequest): Request body
+        request (Request): Raw HTTP request; its body must decode to a schemas.FormulaRequest
 
     Returns:
         Response with results
@@ -127,8 +506,15 @@ async def evaluate_formulas(request: schemas.FormulaRequest):
 
     """
     try:
-        data_items = request.data
-        formulas = request.formulas
+        try:
+            body = msgspec.json.decode(await request.body(), type=schemas.FormulaRequest)
+        except msgspec.DecodeError as e:
+            raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid request body: {e}"
+            )
+        data_items = body.data
+        formulas = body.formulas
         if len(data_items) == 0:
             raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -139,58 +525,130 @@ async def evaluate_formulas(request: schemas.FormulaRequest):
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Empty formulas"
             )
-        # Validate the formulas
-        validate_formulas(data_items, formulas)
-
-        # Dictionary to store results per outputVar
-        results = {formula.outputVar: [] for formula in formulas}
-
-        # Process each data item
-        for item in data_items:
-            # Clone the item dictionary to keep track of dynamic changes for each data point
-            local_item = item.copy()
-
-            # For each formula
-            for formula in formulas:
-                # Prepare variables for the expression
-                variables = {}
-                for input_var in formula.inputs:
-                    var_name = input_var.varName
-                    if var_name in local_item:
-                        try:
-                            variables[var_name] = convert_variable(local_item[var_name], input_var.varType)
-                        except Exception as e:
-                            raise HTTPException(
-                                    status_code=status.HTTP_400_BAD_REQUEST,
-                                    detail=f"Error while converting variable: {e}"
-                            )
-                    else:
+        # Validate the formulas and evaluate in dependency order
+        formulas = validate_formulas(data_items, formulas)
+
+        # Dictionary to store results per outputVar, filled with one
+        # full-size array per formula as evaluation proceeds
+        results = {}
+
+        n_items = len(data_items)
+
+        # Resolve each formula's inputs and converters once up front:
+        # attribute access and type dispatch are data-independent, so there
+        # is no reason to repeat them per data item
+        plan = []
+        for formula in formulas:
+            inputs = []
+            for input_var in formula.inputs:
+                converter = _CONVERTERS.get(input_var.varType)
+                if converter is None:
+                    raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Error while converting variable: Unsupported variable type: {input_var.varType}"
+                    )
+                inputs.append((input_var.varName, input_var.varType, converter))
+            plan.append((formula.outputVar, formula.expression, inputs))
+
+        # Build one NumPy column per referenced input variable spanning all
+        # data items (structure-of-arrays), so each formula is evaluated once
+        # on full vectors instead of once per row
+        columns = {}
+        produced = set()
+        for output_var, expression, inputs in plan:
+            for var_name, var_type, converter in inputs:
+                # Outputs of earlier formulas are already columns; others are
+                # converted from the raw data items, keyed by (name, type) so
+                # formulas disagreeing on a variable's type stay independent
+                if var_name in produced or (var_name, var_type) in columns:
+                    continue
+                column = []
+                for item in data_items:
+                    value = item.get(var_name, _MISSING)
+                    if value is _MISSING:
                         raise HTTPException(
                                 status_code=status.HTTP_400_BAD_REQUEST,
                                 detail=f"Variable '{var_name}' not found in data item with id {item.get('id', 'unknown')}"
                         )
+                    try:
+                        column.append(converter(value))
+                    except Exception as e:
+                        raise HTTPException(
+                                status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"Error while converting variable: {e}"
+                        )
+                columns[(var_name, var_type)] = np.array(column)
+            produced.add(output_var)
+
+        # Purely numeric formula chains run through a single fused JIT
+        # kernel: one pass over memory computes every formula at once
+        evaluated = _try_fused_evaluation(plan, columns, n_items)
+        if evaluated is not None:
+            results.update(evaluated)
+        else:
+            # Evaluate each formula once over the full columns, in
+            # dependency order so earlier outputs feed later formulas
+            evaluated = {}
+            for output_var, expression, inputs in plan:
+                types_by_name = {var_name: var_type for var_name, var_type, converter in inputs}
+
+                def resolve(name):
+                    if name in evaluated:
+                        return evaluated[name]
+                    return columns[(name, types_by_name[name])]
 
-                # Evaluate the expression using the variables
                 try:
-                    result = numexpr.evaluate(formula.expression, local_dict=variables)
-                    # Convert result to a native Python type (if necessary)
-                    result_value = result.item() if hasattr(result, 'item') else result
-                    # Store the result in the results dictionary under the formula's outputVar
-                    results[formula.outputVar].append(result_value)
-                    # Update local_item so the result can be used in subsequent formulas
-                    local_item[formula.outputVar] = result_value
+                    # Small batches skip numexpr's thread barrier and run
+                    # as plain NumPy arithmetic on the same arrays. Both
+                    # fast paths take their arrays positionally, so no
+                    # namespace dict is built per evaluation.
+                    small = _numpy_callable(expression) if n_items * len(expression) < _SMALL_WORKLOAD else None
+                    compiled = compile_expression(expression) if small is None else None
+                    result = None
+                    if small is not None:
+                        func, arg_names = small
+                        result = func(*[resolve(name) for name in arg_names])
+                    elif compiled is not None:
+                        # The compiled form types every input as double, so
+                        # only call it when the columns already are; bool or
+                        # int columns would have their results coerced to
+                        # float, making values depend on batch size
+                        arrays = [resolve(name) for name in compiled.input_names]
+                        if all(array.dtype == np.float64 for array in arrays):
+                            result = compiled(*arrays)
+                    if result is None:
+                        variables = {var_name: resolve(var_name) for var_name in types_by_name}
+                        result = numexpr.evaluate(expression, local_dict=variables)
+                    result = np.asarray(result)
+                    # Constant and reduction expressions evaluate to a
+                    # scalar; materialize a full column so every data item
+                    # gets a value (a zero-stride broadcast view is not
+                    # C-contiguous, which orjson refuses to serialize)
+                    if result.ndim == 0:
+                        result = np.full(n_items, result.item())
+                    evaluated[output_var] = result
+                    results[output_var] = result
                 except Exception as e:
                     raise HTTPException(
                             status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"Error evaluating expression '{formula.expression}': {str(e)}"
+                            detail=f"Error evaluating expression '{expression}': {str(e)}"
                     )
 
-        # Return the results in the specified format
-        return {
+        # orjson serializes numeric NumPy arrays natively but refuses
+        # object-dtype ones; hand those (e.g. datetime results) over as
+        # Python lists, whose datetime elements orjson does understand
+        for output_var, result in results.items():
+            if result.dtype == object:
+                results[output_var] = result.tolist()
+
+        # Return the results in the specified format. Building the response
+        # directly lets orjson serialize the NumPy result arrays natively,
+        # skipping FastAPI's per-element jsonable_encoder walk.
+        return ORJSONResponse({
             "results": results,
             "status" : "success",
             "message": "The formulas were executed successfully with variable-based chaining."
-        }
+        })
     except HTTPException as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.detail))
     except Exception as e:
@@ -1,19 +1,19 @@
 from typing import Any, Dict, List
 
-from pydantic import BaseModel
+import msgspec
 
 
-class InputVar(BaseModel):
+class InputVar(msgspec.Struct):
     varName: str
     varType: str  # Can be "number", "boolean", "datetime", "currency", "percentage"
 
 
-class Formula(BaseModel):
+class Formula(msgspec.Struct):
     outputVar: str
     expression: str
     inputs: List[InputVar]
 
 
-class FormulaRequest(BaseModel):
+class FormulaRequest(msgspec.Struct):
     data: List[Dict[str, Any]]  # Data items with arbitrary fields
     formulas: List[Formula]
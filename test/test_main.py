@@ -184,3 +184,250 @@ async def test_empty_data_or_formula():
     assert response.status_code == 400
     json_response = response.json()
     assert "Empty formulas" == json_response["detail"]
+
+
+@pytest.mark.asyncio
+async def test_string_boolean_whitelist():
+    # String booleans go through a whitelist: "false"/"no" must convert to
+    # False rather than the truthy value bool() would have produced
+    request_data = {
+        "data"    : [
+            {
+                "id"  : 1,
+                "flag": "false"
+            },
+            {
+                "id"  : 2,
+                "flag": "true"
+            },
+            {
+                "id"  : 3,
+                "flag": "no"
+            },
+            {
+                "id"  : 4,
+                "flag": "1"
+            }
+        ],
+        "formulas": [
+            {
+                "outputVar" : "result",
+                "expression": "flag",
+                "inputs"    : [
+                    {
+                        "varName": "flag",
+                        "varType": "boolean"
+                    }
+                ]
+            }
+        ]
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/execute-formula", json=request_data)
+    assert response.status_code == 200
+
+    json_response = response.json()
+    assert json_response["status"] == "success"
+    assert json_response["results"]["result"] == [False, True, False, True]
+
+
+@pytest.mark.asyncio
+async def test_invalid_boolean_string():
+    request_data = {
+        "data"    : [
+            {
+                "id"  : 1,
+                "flag": "maybe"
+            }
+        ],
+        "formulas": [
+            {
+                "outputVar" : "result",
+                "expression": "flag",
+                "inputs"    : [
+                    {
+                        "varName": "flag",
+                        "varType": "boolean"
+                    }
+                ]
+            }
+        ]
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/execute-formula", json=request_data)
+    assert response.status_code == 400
+    json_response = response.json()
+    assert "Error while converting variable" in json_response["detail"]
+    assert "Invalid boolean value" in json_response["detail"]
+
+
+@pytest.mark.asyncio
+async def test_chained_formulas_out_of_order():
+    # Formulas may be submitted in any order; the dependency sort must run
+    # r1 before the r2 that consumes it
+    request_data = {
+        "data"    : [
+            {
+                "id"    : 1,
+                "fieldA": 10
+            },
+            {
+                "id"    : 2,
+                "fieldA": 20
+            }
+        ],
+        "formulas": [
+            {
+                "outputVar" : "r2",
+                "expression": "r1 + fieldA",
+                "inputs"    : [
+                    {
+                        "varName": "r1",
+                        "varType": "number"
+                    },
+                    {
+                        "varName": "fieldA",
+                        "varType": "number"
+                    }
+                ]
+            },
+            {
+                "outputVar" : "r1",
+                "expression": "fieldA * 2",
+                "inputs"    : [
+                    {
+                        "varName": "fieldA",
+                        "varType": "number"
+                    }
+                ]
+            }
+        ]
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/execute-formula", json=request_data)
+    assert response.status_code == 200
+
+    json_response = response.json()
+    assert json_response["status"] == "success"
+    assert json_response["results"]["r1"] == [20, 40]
+    assert json_response["results"]["r2"] == [30, 60]
+
+
+@pytest.mark.asyncio
+async def test_circular_formula_dependency():
+    # Indirect cycles (a needs b, b needs a) must be rejected
+    request_data = {
+        "data"    : [
+            {
+                "id"    : 1,
+                "fieldA": 10
+            }
+        ],
+        "formulas": [
+            {
+                "outputVar" : "a",
+                "expression": "b + 1",
+                "inputs"    : [
+                    {
+                        "varName": "b",
+                        "varType": "number"
+                    }
+                ]
+            },
+            {
+                "outputVar" : "b",
+                "expression": "a + 1",
+                "inputs"    : [
+                    {
+                        "varName": "a",
+                        "varType": "number"
+                    }
+                ]
+            }
+        ]
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/execute-formula", json=request_data)
+    assert response.status_code == 400
+    json_response = response.json()
+    assert "circular dependency" in json_response["detail"]
+
+
+@pytest.mark.asyncio
+async def test_datetime_result_serialization():
+    # Datetime-valued results are object-dtype arrays and must still reach
+    # the client as ISO strings
+    request_data = {
+        "data"    : [
+            {
+                "id": 1,
+                "d" : "2024-01-15"
+            },
+            {
+                "id": 2,
+                "d" : "2024-02-20T10:30:00"
+            }
+        ],
+        "formulas": [
+            {
+                "outputVar" : "result",
+                "expression": "d",
+                "inputs"    : [
+                    {
+                        "varName": "d",
+                        "varType": "datetime"
+                    }
+                ]
+            }
+        ]
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/execute-formula", json=request_data)
+    assert response.status_code == 200
+
+    json_response = response.json()
+    assert json_response["status"] == "success"
+    assert json_response["results"]["result"] == ["2024-01-15T00:00:00", "2024-02-20T10:30:00"]
+
+
+@pytest.mark.asyncio
+async def test_scalar_result_broadcasts_to_all_items():
+    # Constant expressions and reductions evaluate to a single scalar that
+    # must still produce one value per data item in the response
+    request_data = {
+        "data"    : [
+            {
+                "id": 1,
+                "x" : 10
+            },
+            {
+                "id": 2,
+                "x" : 20
+            }
+        ],
+        "formulas": [
+            {
+                "outputVar" : "constant",
+                "expression": "5 + 3",
+                "inputs"    : []
+            },
+            {
+                "outputVar" : "total",
+                "expression": "sum(x)",
+                "inputs"    : [
+                    {
+                        "varName": "x",
+                        "varType": "number"
+                    }
+                ]
+            }
+        ]
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/execute-formula", json=request_data)
+    assert response.status_code == 200
+
+    json_response = response.json()
+    assert json_response["status"] == "success"
+    assert json_response["results"]["constant"] == [8, 8]
+    assert json_response["results"]["total"] == [30, 30]